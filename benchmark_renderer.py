@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+import random
+import argparse
+from typing import List, Optional
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from main import Shape
+from renderer import TileRenderer, render_scene
+
+
+def make_scene(count: int, width: int, height: int, borders: int, seed: int = 0) -> List[Shape]:
+    rng = random.Random(seed)
+    shapes = []
+    for _ in range(count):
+        shape_type = rng.choice(["rectangle", "circle", "ellipse", "line"])
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        x, y = rng.randrange(width), rng.randrange(height)
+        if shape_type == "circle":
+            points = [(x, y), (rng.randrange(2, 30),)]
+        else:
+            points = [(x, y), (x + rng.randrange(-60, 60), y + rng.randrange(-60, 60))]
+        filled = shape_type != "line" and rng.random() < 0.5
+        shapes.append(Shape(shape_type, color, points, rng.randrange(1, 5), filled))
+    for i in range(borders):
+        margin = i * 20
+        shapes.append(Shape("rectangle", (0, 0, 0), [(margin, margin), (width - margin, height - margin)], 4, False))
+    return shapes
+
+
+def timed(render) -> float:
+    began = time.perf_counter()
+    render()
+    return time.perf_counter() - began
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare TileRenderer against the single-process renderer")
+    parser.add_argument("--shapes", type=int, default=50000)
+    parser.add_argument("--size", type=int, nargs=2, default=[8000, 6000])
+    parser.add_argument("--borders", type=int, default=0, help="image-spanning unfilled rectangles")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args(argv)
+
+    area = pygame.Rect(0, 0, *args.size)
+    shapes = make_scene(args.shapes, area.width, area.height, args.borders)
+    print(f"{args.shapes} shapes, {args.borders} borders, {area.width}x{area.height}, {os.cpu_count()} CPUs")
+    print(f"{'renderer':<20}{'seconds':>10}")
+    print(f"{'render_scene':<20}{timed(lambda: render_scene(shapes, area)):>10.2f}")
+    for workers in args.workers:
+        seconds = timed(lambda: TileRenderer(workers=workers).render(shapes, area))
+        print(f"{'workers=' + str(workers):<20}{seconds:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
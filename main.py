@@ -2,6 +2,9 @@ import pygame
 import pygame.gfxdraw
 import json
 import math
+import os
+import time
+import itertools
 from typing import List, Dict, Tuple, Optional, Union
 
 pygame.init()
@@ -22,10 +25,19 @@ BUTTON_HEIGHT = 30
 PADDING = 10
 SHAPE_TYPES = ["rectangle", "circle", "ellipse", "line", "polygon", "arc"]
 TOOLBAR_WIDTH = 200
+GENERATED_CODE_FILE = "generated_drawing.py"
+SAVE_MESSAGE_DELAY_MS = 2000
+ACTIVE_FPS = 60
+IDLE_TIMEOUT_MS = 1000
+
+_shape_ids = itertools.count()
+_symbol_ids = itertools.count()
 
 class Shape:
     def __init__(self, shape_type: str, color: Tuple[int, int, int], points: List[Tuple[int, int]], 
                  width: int = 0, filled: bool = True, rotation: int = 0):
+        self.shape_id = next(_shape_ids)
+        self.version = 0
         self.shape_type = shape_type
         self.color = color
         self.points = points
@@ -36,6 +48,26 @@ class Shape:
         self.dragging = False
         self.resize_handle = None
         self.original_points = points.copy()
+    
+    def touch(self):
+        self.version += 1
+    
+    def copy(self) -> "Shape":
+        shape = Shape(self.shape_type, self.color, list(self.points), self.width, self.filled, self.rotation)
+        shape.selected = self.selected
+        return shape
+    
+    def get_local_copy(self) -> Tuple["Shape", Tuple[int, int]]:
+        rect = self.get_rect()
+        rect.normalize()
+        local_shape = self.copy()
+        local_shape.selected = False
+        local_shape.move(-rect.x, -rect.y)
+        return local_shape, rect.topleft
+    
+    def get_geometry_key(self) -> tuple:
+        points = tuple(tuple(p) if isinstance(p, (tuple, list)) else p for p in self.points)
+        return (self.shape_type, tuple(self.color), points, self.width, self.filled, self.rotation)
 
     def draw(self, surface: pygame.Surface):
         if self.shape_type == "rectangle":
@@ -149,6 +181,7 @@ class Shape:
                 else:
                     new_points.append(p)
             self.points = new_points
+        self.touch()
     
     def resize(self, handle_index: int, dx: int, dy: int):
         rect = self.get_rect()
@@ -208,6 +241,8 @@ class Shape:
                     elif handle_index in [1, 6]:
                         if dir_y < 0 or dir_y > 0:
                             self.points[i] = (x, y + dy)
+        
+        self.touch()
 
 def point_in_polygon(point: Tuple[int, int], polygon: List[Tuple[int, int]]) -> bool:
     x, y = point
@@ -228,6 +263,92 @@ def point_in_polygon(point: Tuple[int, int], polygon: List[Tuple[int, int]]) ->
     
     return inside
 
+class Symbol:
+    def __init__(self, shapes: List[Shape]):
+        self.symbol_id = next(_symbol_ids)
+        self.shapes = [shape.copy() for shape in shapes]
+        for shape in self.shapes:
+            shape.selected = False
+        self.bounds = self.get_bounds()
+        self.surface: Optional[pygame.Surface] = None
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["surface"] = None
+        return state
+    
+    def get_bounds(self) -> pygame.Rect:
+        rects = []
+        for shape in self.shapes:
+            rect = shape.get_rect()
+            rect.normalize()
+            rects.append(rect.inflate(shape.width * 2 + 4, shape.width * 2 + 4))
+        return rects[0].unionall(rects[1:])
+    
+    def get_surface(self) -> pygame.Surface:
+        if self.surface is None:
+            self.surface = pygame.Surface(self.bounds.size, pygame.SRCALPHA)
+            for shape in self.get_local_shapes():
+                shape.draw(self.surface)
+            if pygame.display.get_surface() is not None:
+                self.surface = self.surface.convert_alpha()
+        return self.surface
+    
+    def get_local_shapes(self) -> List[Shape]:
+        local_shapes = []
+        for shape in self.shapes:
+            local_shape = shape.copy()
+            local_shape.move(-self.bounds.x, -self.bounds.y)
+            local_shapes.append(local_shape)
+        return local_shapes
+    
+    def contains_point(self, point: Tuple[int, int]) -> bool:
+        if not self.bounds.collidepoint(point):
+            return False
+        return any(shape.contains_point(point) for shape in self.shapes)
+
+class SymbolInstance:
+    __slots__ = ["symbol", "offset", "selected", "dragging", "resize_handle", "shape_id", "version"]
+    shape_type = "symbol"
+    width = 0
+    filled = True
+    
+    def __init__(self, symbol: Symbol, offset: Tuple[int, int] = (0, 0)):
+        self.symbol = symbol
+        self.offset = offset
+        self.selected = False
+        self.dragging = False
+        self.resize_handle = None
+        self.shape_id = next(_shape_ids)
+        self.version = 0
+    
+    def draw(self, surface: pygame.Surface):
+        rect = self.get_rect()
+        surface.blit(self.symbol.get_surface(), rect)
+        if self.selected:
+            pygame.draw.rect(surface, COLOR_RED, rect, 1)
+    
+    def get_rect(self) -> pygame.Rect:
+        return self.symbol.bounds.move(self.offset)
+    
+    def contains_point(self, point: Tuple[int, int]) -> bool:
+        return self.symbol.contains_point((point[0] - self.offset[0], point[1] - self.offset[1]))
+    
+    def get_resize_handle_at_point(self, point: Tuple[int, int]) -> Optional[int]:
+        return None
+    
+    def move(self, dx: int, dy: int):
+        self.offset = (self.offset[0] + dx, self.offset[1] + dy)
+        self.version += 1
+    
+    def resize(self, handle_index: int, dx: int, dy: int):
+        pass
+    
+    def copy(self) -> "SymbolInstance":
+        instance = SymbolInstance(self.symbol, self.offset)
+        instance.selected = self.selected
+        return instance
+
 class Button:
     def __init__(self, x: int, y: int, width: int, height: int, text: str, 
                  color: Tuple[int, int, int] = COLOR_GRAY, 
@@ -306,6 +427,43 @@ class ColorPicker:
             return self.colors[index]
         return None
 
+class FrameScheduler:
+    def __init__(self, active_fps: int = ACTIVE_FPS, idle_timeout_ms: int = IDLE_TIMEOUT_MS):
+        self.active_fps = active_fps
+        self.idle_timeout_ms = idle_timeout_ms
+        self.clock = pygame.time.Clock()
+        self.idle_wall_time = 0.0
+        self.idle_cpu_time = 0.0
+        self.idle_start: Optional[Tuple[float, float]] = None
+    
+    def wait_for_events(self, active: bool) -> List[pygame.event.Event]:
+        self.end_idle_period()
+        if active:
+            self.clock.tick(self.active_fps)
+            return pygame.event.get()
+        
+        self.idle_start = (time.perf_counter(), time.process_time())
+        event = pygame.event.wait(self.idle_timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return []
+        
+        self.clock.tick(self.active_fps)
+        return [event] + pygame.event.get()
+    
+    def end_idle_period(self):
+        if self.idle_start is None:
+            return
+        wall_start, cpu_start = self.idle_start
+        self.idle_wall_time += time.perf_counter() - wall_start
+        self.idle_cpu_time += time.process_time() - cpu_start
+        self.idle_start = None
+    
+    @property
+    def idle_cpu_usage(self) -> float:
+        if self.idle_wall_time == 0:
+            return 0.0
+        return self.idle_cpu_time / self.idle_wall_time
+
 class PygameCalculator:
     def __init__(self, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT):
         self.width = max(width, MIN_WINDOW_SIZE[0])
@@ -316,8 +474,8 @@ class PygameCalculator:
         
         self.drawing_area = pygame.Rect(TOOLBAR_WIDTH, 0, self.width - TOOLBAR_WIDTH, self.height)
         
-        self.shapes: List[Shape] = []
-        self.selected_shape: Optional[Shape] = None
+        self.shapes: List[Union[Shape, SymbolInstance]] = []
+        self.selected_shape: Optional[Union[Shape, SymbolInstance]] = None
         self.current_shape: Optional[Shape] = None
         self.current_shape_type = "rectangle"
         self.current_color = COLOR_RED
@@ -329,6 +487,17 @@ class PygameCalculator:
         self.resizing = False
         self.last_pos = (0, 0)
         
+        self.generated_code_file = GENERATED_CODE_FILE
+        self.save_message_delay = SAVE_MESSAGE_DELAY_MS
+        self.code_fragments: Dict[int, Tuple[int, str]] = {}
+        self.symbol_code: Dict[int, str] = {}
+        self.instance_code: Dict[Tuple[Tuple[int, int], ...], str] = {}
+        self.symbol_cache: Dict[tuple, Symbol] = {}
+        self.written_code_parts: List[str] = []
+        self.written_code_stat: Optional[Tuple[int, int]] = None
+        
+        self.recorder = None
+        
         self.create_ui_elements()
         
         self.grid_size = 20
@@ -402,42 +571,58 @@ class PygameCalculator:
             "Generate Code",
             (100, 255, 100))
     
-    def handle_events(self):
-        mouse_pos = pygame.mouse.get_pos()
+    def handle_events(self, events: Optional[List[pygame.event.Event]] = None,
+                      mouse_pos: Optional[Tuple[int, int]] = None):
+        if mouse_pos is None:
+            mouse_pos = pygame.mouse.get_pos()
+        if events is None:
+            events = pygame.event.get()
+        if self.recorder:
+            self.recorder.record_frame(mouse_pos, events)
         mouse_in_drawing_area = self.drawing_area.collidepoint(mouse_pos)
         
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        for event in events:
+            if not self.handle_event(event, mouse_pos, mouse_in_drawing_area):
                 return False
-            
-            elif event.type == pygame.VIDEORESIZE:
-                self.handle_resize(event)
-            
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    self.handle_left_click(mouse_pos, mouse_in_drawing_area)
-                elif event.button == 3 and self.drawing and self.current_shape_type == "polygon":
-                    if len(self.current_shape.points) >= 3:
-                        self.shapes.append(self.current_shape)
-                        self.current_shape = None
-                        self.drawing = False
-            
-            elif event.type == pygame.MOUSEBUTTONUP:
-                if event.button == 1:
-                    self.handle_left_click_release(mouse_pos)
-            
-            elif event.type == pygame.MOUSEMOTION:
-                self.handle_mouse_motion(mouse_pos, mouse_in_drawing_area)
-            
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_DELETE and self.selected_shape:
-                    self.shapes.remove(self.selected_shape)
-                    self.selected_shape = None
-                elif event.key == pygame.K_RETURN and self.drawing and self.current_shape_type == "polygon":
-                    if len(self.current_shape.points) >= 3:
-                        self.shapes.append(self.current_shape)
-                        self.current_shape = None
-                        self.drawing = False
+        
+        return True
+    
+    def handle_event(self, event: pygame.event.Event, mouse_pos: Tuple[int, int],
+                     mouse_in_drawing_area: bool) -> bool:
+        if event.type == pygame.QUIT:
+            return False
+        
+        elif event.type == pygame.VIDEORESIZE:
+            self.handle_resize(event)
+        
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:
+                self.handle_left_click(mouse_pos, mouse_in_drawing_area)
+            elif event.button == 3 and self.drawing and self.current_shape_type == "polygon":
+                if len(self.current_shape.points) >= 3:
+                    self.shapes.append(self.current_shape)
+                    self.current_shape = None
+                    self.drawing = False
+        
+        elif event.type == pygame.MOUSEBUTTONUP:
+            if event.button == 1:
+                self.handle_left_click_release(mouse_pos)
+        
+        elif event.type == pygame.MOUSEMOTION:
+            self.handle_mouse_motion(mouse_pos, mouse_in_drawing_area)
+        
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_DELETE and self.selected_shape:
+                self.shapes.remove(self.selected_shape)
+                self.selected_shape = None
+            elif event.key == pygame.K_d and event.mod & pygame.KMOD_CTRL and self.selected_shape:
+                if not (self.moving or self.resizing or self.drawing):
+                    self.duplicate_selected_shape()
+            elif event.key == pygame.K_RETURN and self.drawing and self.current_shape_type == "polygon":
+                if len(self.current_shape.points) >= 3:
+                    self.shapes.append(self.current_shape)
+                    self.current_shape = None
+                    self.drawing = False
         
         return True
     
@@ -495,6 +680,7 @@ class PygameCalculator:
             if mouse_in_drawing_area:
                 if self.drawing and self.current_shape and self.current_shape_type == "polygon":
                     self.current_shape.points.append(mouse_pos)
+                    self.current_shape.touch()
                 else:
                     self.deselect_all_shapes()
                     self.start_new_shape(mouse_pos)
@@ -526,6 +712,7 @@ class PygameCalculator:
         
         if self.clear_button.is_clicked(mouse_pos, mouse_event):
             self.shapes = []
+            self.symbol_cache = {}
             self.selected_shape = None
             self.current_shape = None
             return
@@ -564,6 +751,7 @@ class PygameCalculator:
                 self.current_shape.points[1] = (radius,)
             elif self.current_shape_type == "line":
                 self.current_shape.points[1] = mouse_pos
+            self.current_shape.touch()
         
         self.last_pos = mouse_pos
     
@@ -605,6 +793,25 @@ class PygameCalculator:
         
         self.drawing = True
     
+    def duplicate_selected_shape(self):
+        selected = self.selected_shape
+        if isinstance(selected, Shape):
+            local_shape, offset = selected.get_local_copy()
+            key = local_shape.get_geometry_key()
+            if key not in self.symbol_cache:
+                self.symbol_cache[key] = Symbol([local_shape])
+            symbol = self.symbol_cache[key]
+        else:
+            symbol = selected.symbol
+            offset = selected.offset
+        
+        duplicate = SymbolInstance(symbol, (offset[0] + self.grid_size, offset[1] + self.grid_size))
+        self.shapes.append(duplicate)
+        
+        self.deselect_all_shapes()
+        duplicate.selected = True
+        self.selected_shape = duplicate
+    
     def deselect_all_shapes(self):
         for shape in self.shapes:
             shape.selected = False
@@ -663,8 +870,114 @@ class PygameCalculator:
         if self.current_shape:
             self.current_shape.draw(self.screen)
     
+    def generate_shape_code(self, shape: Shape) -> str:
+        if shape.shape_type == "rectangle":
+            rect = shape.get_rect()
+            if shape.filled:
+                return f"    pygame.draw.rect(surface, {shape.color}, pygame.Rect({rect.x}, {rect.y}, {rect.width}, {rect.height}), 0)\n"
+            else:
+                return f"    pygame.draw.rect(surface, {shape.color}, pygame.Rect({rect.x}, {rect.y}, {rect.width}, {rect.height}), {shape.width})\n"
+        
+        elif shape.shape_type == "circle":
+            center = shape.points[0]
+            radius = shape.points[1][0]
+            if shape.filled:
+                return f"    pygame.draw.circle(surface, {shape.color}, ({center[0]}, {center[1]}), {radius}, 0)\n"
+            else:
+                return f"    pygame.draw.circle(surface, {shape.color}, ({center[0]}, {center[1]}), {radius}, {shape.width})\n"
+        
+        elif shape.shape_type == "ellipse":
+            rect = shape.get_rect()
+            if shape.filled:
+                return f"    pygame.draw.ellipse(surface, {shape.color}, pygame.Rect({rect.x}, {rect.y}, {rect.width}, {rect.height}), 0)\n"
+            else:
+                return f"    pygame.draw.ellipse(surface, {shape.color}, pygame.Rect({rect.x}, {rect.y}, {rect.width}, {rect.height}), {shape.width})\n"
+        
+        elif shape.shape_type == "line":
+            p1, p2 = shape.points
+            return f"    pygame.draw.line(surface, {shape.color}, ({p1[0]}, {p1[1]}), ({p2[0]}, {p2[1]}), {shape.width})\n"
+        
+        elif shape.shape_type == "polygon":
+            points = ", ".join(f"({p[0]}, {p[1]})" for p in shape.points)
+            if shape.filled:
+                return f"    pygame.draw.polygon(surface, {shape.color}, [{points}], 0)\n"
+            else:
+                return f"    pygame.draw.polygon(surface, {shape.color}, [{points}], {shape.width})\n"
+        
+        elif shape.shape_type == "arc":
+            rect = shape.get_rect()
+            start_angle, end_angle = shape.points[2], shape.points[3]
+            return f"    pygame.draw.arc(surface, {shape.color}, pygame.Rect({rect.x}, {rect.y}, {rect.width}, {rect.height}), {start_angle}, {end_angle}, {shape.width})\n"
+        return ""
+    
+    def get_shape_code(self, shape: Shape) -> str:
+        cached = self.code_fragments.get(shape.shape_id)
+        if cached and cached[0] == shape.version:
+            return cached[1]
+        
+        fragment = self.generate_shape_code(shape)
+        self.code_fragments[shape.shape_id] = (shape.version, fragment)
+        return fragment
+    
+    def get_symbol_code(self, symbol: Symbol) -> str:
+        if symbol.symbol_id not in self.symbol_code:
+            code = f"\ndef create_symbol_{symbol.symbol_id}():\n"
+            code += f"    surface = pygame.Surface(({symbol.bounds.width}, {symbol.bounds.height}), pygame.SRCALPHA)\n"
+            for shape in symbol.get_local_shapes():
+                code += self.generate_shape_code(shape)
+            code += "    return surface\n"
+            code += f"\nSYMBOL_{symbol.symbol_id} = create_symbol_{symbol.symbol_id}()\n"
+            self.symbol_code[symbol.symbol_id] = code
+        return self.symbol_code[symbol.symbol_id]
+    
+    def get_instances_code(self, instances: List[SymbolInstance],
+                           live_instance_code: Dict[Tuple[Tuple[int, int], ...], str]) -> str:
+        key = tuple((instance.shape_id, instance.version) for instance in instances)
+        code = self.instance_code.get(key)
+        if code is None:
+            code = self.generate_instances_code(instances)
+        live_instance_code[key] = code
+        return code
+    
+    def generate_instances_code(self, instances: List[SymbolInstance]) -> str:
+        symbol = instances[0].symbol
+        positions = [instance.get_rect().topleft for instance in instances]
+        if len(positions) == 1:
+            return f"    surface.blit(SYMBOL_{symbol.symbol_id}, {positions[0]})\n"
+        
+        code = f"    for position in {positions}:\n"
+        code += f"        surface.blit(SYMBOL_{symbol.symbol_id}, position)\n"
+        return code
+    
+    def write_generated_code(self, parts: List[str]):
+        unchanged = 0
+        filename = self.generated_code_file
+        if self.get_file_stat(filename) == self.written_code_stat:
+            for old, new in zip(self.written_code_parts, parts):
+                if old != new:
+                    break
+                unchanged += 1
+        
+        offset = sum(len(part) for part in parts[:unchanged])
+        mode = "r+b" if unchanged else "wb"
+        
+        with open(filename, mode) as f:
+            f.seek(offset)
+            f.write("".join(parts[unchanged:]).encode("ascii"))
+            f.truncate()
+        
+        self.written_code_parts = parts
+        self.written_code_stat = self.get_file_stat(filename)
+    
+    @staticmethod
+    def get_file_stat(filename: str) -> Optional[Tuple[int, int]]:
+        if not os.path.exists(filename):
+            return None
+        stat = os.stat(filename)
+        return (stat.st_size, stat.st_mtime_ns)
+    
     def generate_pygame_code(self):
-        code = """import pygame
+        header = """import pygame
 import sys
 
 pygame.init()
@@ -678,49 +991,41 @@ COLOR_WHITE = (255, 255, 255)
 COLOR_BLACK = (0, 0, 0)
 """.format(width=self.drawing_area.width, height=self.drawing_area.height)
 
-        code += "\ndef draw_shapes(surface):\n"
-        code += "    surface.fill(COLOR_WHITE)\n"
-        
-        for i, shape in enumerate(self.shapes):
-            if shape.shape_type == "rectangle":
-                rect = shape.get_rect()
-                if shape.filled:
-                    code += f"    pygame.draw.rect(surface, {shape.color}, pygame.Rect({rect.x}, {rect.y}, {rect.width}, {rect.height}), 0)\n"
-                else:
-                    code += f"    pygame.draw.rect(surface, {shape.color}, pygame.Rect({rect.x}, {rect.y}, {rect.width}, {rect.height}), {shape.width})\n"
-            
-            elif shape.shape_type == "circle":
-                center = shape.points[0]
-                radius = shape.points[1][0]
-                if shape.filled:
-                    code += f"    pygame.draw.circle(surface, {shape.color}, ({center[0]}, {center[1]}), {radius}, 0)\n"
-                else:
-                    code += f"    pygame.draw.circle(surface, {shape.color}, ({center[0]}, {center[1]}), {radius}, {shape.width})\n"
-            
-            elif shape.shape_type == "ellipse":
-                rect = shape.get_rect()
-                if shape.filled:
-                    code += f"    pygame.draw.ellipse(surface, {shape.color}, pygame.Rect({rect.x}, {rect.y}, {rect.width}, {rect.height}), 0)\n"
-                else:
-                    code += f"    pygame.draw.ellipse(surface, {shape.color}, pygame.Rect({rect.x}, {rect.y}, {rect.width}, {rect.height}), {shape.width})\n"
-            
-            elif shape.shape_type == "line":
-                p1, p2 = shape.points
-                code += f"    pygame.draw.line(surface, {shape.color}, ({p1[0]}, {p1[1]}), ({p2[0]}, {p2[1]}), {shape.width})\n"
-            
-            elif shape.shape_type == "polygon":
-                points = ", ".join(f"({p[0]}, {p[1]})" for p in shape.points)
-                if shape.filled:
-                    code += f"    pygame.draw.polygon(surface, {shape.color}, [{points}], 0)\n"
-                else:
-                    code += f"    pygame.draw.polygon(surface, {shape.color}, [{points}], {shape.width})\n"
+        draw_header = "\ndef draw_shapes(surface):\n"
+        draw_header += "    surface.fill(COLOR_WHITE)\n"
+        
+        live_ids = {shape.shape_id for shape in self.shapes}
+        for shape_id in list(self.code_fragments):
+            if shape_id not in live_ids:
+                del self.code_fragments[shape_id]
+        
+        symbols: Dict[int, Symbol] = {}
+        fragments = []
+        run: List[SymbolInstance] = []
+        live_instance_code: Dict[Tuple[Tuple[int, int], ...], str] = {}
+        for shape in self.shapes:
+            if run and not (isinstance(shape, SymbolInstance) and shape.symbol is run[0].symbol):
+                fragments.append(self.get_instances_code(run, live_instance_code))
+                run = []
             
-            elif shape.shape_type == "arc":
-                rect = shape.get_rect()
-                start_angle, end_angle = shape.points[2], shape.points[3]
-                code += f"    pygame.draw.arc(surface, {shape.color}, pygame.Rect({rect.x}, {rect.y}, {rect.width}, {rect.height}), {start_angle}, {end_angle}, {shape.width})\n"
+            if isinstance(shape, SymbolInstance):
+                symbols.setdefault(shape.symbol.symbol_id, shape.symbol)
+                run.append(shape)
+            else:
+                fragments.append(self.get_shape_code(shape))
+        if run:
+            fragments.append(self.get_instances_code(run, live_instance_code))
+        self.instance_code = live_instance_code
+        
+        for symbol_id in list(self.symbol_code):
+            if symbol_id not in symbols:
+                del self.symbol_code[symbol_id]
+        for key, symbol in list(self.symbol_cache.items()):
+            if symbol.symbol_id not in symbols:
+                del self.symbol_cache[key]
+        symbol_parts = [self.get_symbol_code(symbol) for symbol in symbols.values()]
         
-        code += """
+        footer = """
 def main():
     clock = pygame.time.Clock()
     
@@ -738,32 +1043,43 @@ if __name__ == "__main__":
     main()
 """
 
-        with open("generated_drawing.py", "w") as f:
-            f.write(code)
+        self.write_generated_code([header] + symbol_parts + [draw_header] + fragments + [footer])
         
         font = pygame.font.SysFont(None, 36)
-        message = font.render("Code saved to generated_drawing.py", True, COLOR_GREEN)
+        message = font.render(f"Code saved to {os.path.basename(self.generated_code_file)}", True, COLOR_GREEN)
         message_rect = message.get_rect(center=(self.width // 2, self.height - 50))
         
         self.screen.blit(message, message_rect)
         pygame.display.flip()
-        pygame.time.delay(2000)
+        pygame.time.delay(self.save_message_delay)
+    
+    def render_frame(self):
+        self.screen.fill(COLOR_WHITE)
+        
+        self.draw_shapes()
+        self.draw_ui()
+        
+        pygame.display.flip()
+    
+    def is_animating(self) -> bool:
+        drawing = self.drawing and self.current_shape is not None and self.current_shape.shape_type != "polygon"
+        return drawing or self.moving or self.resizing
     
-    def run(self):
-        clock = pygame.time.Clock()
+    def run(self, scheduler: Optional[FrameScheduler] = None):
+        scheduler = scheduler or FrameScheduler()
         running = True
+        self.render_frame()
         
         while running:
-            running = self.handle_events()
-            
-            self.screen.fill(COLOR_WHITE)
-            
-            self.draw_shapes()
-            self.draw_ui()
-            
-            pygame.display.flip()
-            clock.tick(60)
+            active = self.is_animating()
+            events = scheduler.wait_for_events(active)
+            if events:
+                running = self.handle_events(events)
+            if running and (events or active):
+                self.render_frame()
         
+        scheduler.end_idle_period()
+        print(f"Idle CPU usage: {scheduler.idle_cpu_usage:.1%} over {scheduler.idle_wall_time:.1f}s idle")
         pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,265 @@
+import os
+import weakref
+import pygame
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Dict, Tuple, Optional
+
+from main import Shape, SymbolInstance, COLOR_WHITE, COLOR_RED
+
+TILE_SIZE = 512
+PIXEL_FORMAT = "RGBA"
+BYTES_PER_PIXEL = 4
+SLICE_FORMAT = "RGB"
+SLICE_BYTES_PER_PIXEL = 3
+TASKS_PER_WORKER = 4
+
+_worker_memory: Optional[shared_memory.SharedMemory] = None
+_worker_surface: Optional[pygame.Surface] = None
+_worker_shapes: List[Shape] = []
+_worker_tile_size = TILE_SIZE
+_worker_slice_memory: Dict[str, shared_memory.SharedMemory] = {}
+_worker_layer: Optional[pygame.Surface] = None
+
+LayerSlice = Optional[Tuple[str, int, Tuple[int, int], Tuple[int, int], Tuple[int, int, int]]]
+
+
+def get_shape_bounds(shape: Shape) -> pygame.Rect:
+    rect = shape.get_rect()
+    rect.normalize()
+    margin = shape.width + 2
+    if shape.selected:
+        margin = max(margin, 6)
+    return rect.inflate(margin * 2, margin * 2)
+
+
+def is_clip_sensitive(shape: Shape) -> bool:
+    if shape.selected or shape.shape_type == "line":
+        return True
+    return not shape.filled and shape.shape_type in ["rectangle", "polygon"]
+
+
+def split_into_tiles(size: Tuple[int, int], tile_size: int = TILE_SIZE) -> List[pygame.Rect]:
+    width, height = size
+    tiles = []
+    for y in range(0, height, tile_size):
+        for x in range(0, width, tile_size):
+            tiles.append(pygame.Rect(x, y, min(tile_size, width - x), min(tile_size, height - y)))
+    return tiles
+
+
+def assign_shapes_to_tiles(bounds: List[pygame.Rect], size: Tuple[int, int],
+                           tile_size: int = TILE_SIZE, first_index: int = 0) -> Dict[int, List[int]]:
+    columns = -(-size[0] // tile_size)
+    buckets: Dict[int, List[int]] = {}
+    image_rect = pygame.Rect(0, 0, size[0], size[1])
+    for index, rect in enumerate(bounds, first_index):
+        visible = rect.clip(image_rect)
+        if visible.width == 0 or visible.height == 0:
+            continue
+        for row in range(visible.top // tile_size, (visible.bottom - 1) // tile_size + 1):
+            for column in range(visible.left // tile_size, (visible.right - 1) // tile_size + 1):
+                buckets.setdefault(row * columns + column, []).append(index)
+    return buckets
+
+
+def find_crossing_strokes(shapes: List[Shape], bounds: List[pygame.Rect], tiles: List[pygame.Rect],
+                          buckets: Dict[int, List[int]], first_index: int = 0) -> Dict[int, List[int]]:
+    crossing: Dict[int, List[int]] = {}
+    for tile_index, bucket in buckets.items():
+        tile = tiles[tile_index]
+        for index in bucket:
+            local = index - first_index
+            if is_clip_sensitive(shapes[local]) and not tile.contains(bounds[local]):
+                crossing.setdefault(index, []).append(tile_index)
+    return crossing
+
+
+def render_scene(shapes: List[Shape], area: pygame.Rect) -> pygame.Surface:
+    buffer = bytearray(area.width * area.height * BYTES_PER_PIXEL)
+    surface = pygame.image.frombuffer(buffer, area.size, PIXEL_FORMAT)
+    surface.fill(COLOR_WHITE)
+    for shape in shapes:
+        _translated(shape, area.x, area.y).draw(surface)
+    return surface
+
+
+def _translated(shape: Shape, dx: int, dy: int) -> Shape:
+    if not dx and not dy:
+        return shape
+    moved = shape.copy()
+    moved.move(-dx, -dy)
+    return moved
+
+
+def _pick_colorkey(shape: Shape) -> Tuple[int, int, int]:
+    if isinstance(shape, SymbolInstance):
+        used = [tuple(part.color) for part in shape.symbol.shapes]
+    else:
+        used = [tuple(shape.color)]
+    used.append(COLOR_RED)
+    for blue in range(256):
+        if (1, 2, blue) not in used:
+            return (1, 2, blue)
+
+
+def _chunks(items: list, count: int) -> List[list]:
+    step = max(1, -(-len(items) // count))
+    return [items[i:i + step] for i in range(0, len(items), step)]
+
+
+def _release_memory(memory: shared_memory.SharedMemory):
+    memory.close()
+
+
+def _attach_worker(memory_name: str, size: Tuple[int, int], origin: Tuple[int, int],
+                   shapes: List[Shape], tile_size: int):
+    global _worker_memory, _worker_surface, _worker_shapes, _worker_tile_size
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_surface = pygame.image.frombuffer(_worker_memory.buf, size, PIXEL_FORMAT)
+    _worker_shapes = [_translated(shape, origin[0], origin[1]) for shape in shapes]
+    _worker_tile_size = tile_size
+
+
+def _assign_chunk(start: int, stop: int) -> Tuple[Dict[int, List[int]], Dict[int, List[int]]]:
+    size = _worker_surface.get_size()
+    shapes = _worker_shapes[start:stop]
+    bounds = [get_shape_bounds(shape) for shape in shapes]
+    buckets = assign_shapes_to_tiles(bounds, size, _worker_tile_size, start)
+    tiles = split_into_tiles(size, _worker_tile_size)
+    return buckets, find_crossing_strokes(shapes, bounds, tiles, buckets, start)
+
+
+def _get_layer(size: Tuple[int, int]) -> pygame.Surface:
+    global _worker_layer
+    if _worker_layer is None or _worker_layer.get_width() < size[0] or _worker_layer.get_height() < size[1]:
+        current = _worker_layer.get_size() if _worker_layer else (0, 0)
+        _worker_layer = pygame.Surface((max(current[0], size[0]), max(current[1], size[1])))
+    return _worker_layer.subsurface(pygame.Rect((0, 0), size))
+
+
+def _slice_layers(strokes: List[Tuple[int, List[int]]]) -> List[Tuple[int, int, LayerSlice]]:
+    tiles = split_into_tiles(_worker_surface.get_size(), _worker_tile_size)
+    pieces = []
+    for index, tile_indices in strokes:
+        shape = _worker_shapes[index]
+        layer_rect = get_shape_bounds(shape).clip(_worker_surface.get_rect())
+        key = _pick_colorkey(shape)
+        layer = _get_layer(layer_rect.size)
+        layer.fill(key)
+        _translated(shape, layer_rect.x, layer_rect.y).draw(layer)
+        layer.set_colorkey(key)
+        layer_mask = pygame.mask.from_surface(layer)
+
+        for tile_index in tile_indices:
+            part = tiles[tile_index].clip(layer_rect)
+            offset = (part.x - layer_rect.x, part.y - layer_rect.y)
+            part_mask = pygame.mask.Mask(part.size)
+            part_mask.draw(layer_mask, (-offset[0], -offset[1]))
+            drawn_rects = part_mask.get_bounding_rects()
+            if not drawn_rects:
+                pieces.append((index, tile_index, None))
+                continue
+            drawn = drawn_rects[0].unionall(drawn_rects[1:]).move(offset)
+            position = (layer_rect.x + drawn.x, layer_rect.y + drawn.y)
+            pixels = pygame.image.tobytes(layer.subsurface(drawn), SLICE_FORMAT)
+            pieces.append((index, tile_index, (pixels, drawn.size, position, key)))
+
+    total = sum(len(item[2][0]) for item in pieces if item[2])
+    if not total:
+        return pieces
+
+    memory = shared_memory.SharedMemory(create=True, size=total)
+    _worker_slice_memory[memory.name] = memory
+    results = []
+    offset = 0
+    for index, tile_index, piece in pieces:
+        if piece is None:
+            results.append((index, tile_index, None))
+            continue
+        pixels, size, position, key = piece
+        memory.buf[offset:offset + len(pixels)] = pixels
+        results.append((index, tile_index, (memory.name, offset, size, position, key)))
+        offset += len(pixels)
+    return results
+
+
+def _load_slice(layer_slice: LayerSlice) -> Tuple[pygame.Surface, Tuple[int, int]]:
+    name, offset, size, position, key = layer_slice
+    if name not in _worker_slice_memory:
+        _worker_slice_memory[name] = shared_memory.SharedMemory(name=name)
+    length = size[0] * size[1] * SLICE_BYTES_PER_PIXEL
+    pixels = bytes(_worker_slice_memory[name].buf[offset:offset + length])
+    piece = pygame.image.frombytes(pixels, size, SLICE_FORMAT)
+    piece.set_colorkey(key)
+    return piece, position
+
+
+def _render_tile(tile: Tuple[int, int, int, int], indices: List[int], slices: Dict[int, LayerSlice]):
+    rect = pygame.Rect(tile)
+    _worker_surface.fill(COLOR_WHITE, rect)
+    _worker_surface.set_clip(rect)
+    for index in indices:
+        if index not in slices:
+            _worker_shapes[index].draw(_worker_surface)
+        elif slices[index] is not None:
+            piece, position = _load_slice(slices[index])
+            _worker_surface.blit(piece, position)
+    _worker_surface.set_clip(None)
+
+
+class TileRenderer:
+    def __init__(self, tile_size: int = TILE_SIZE, workers: Optional[int] = None):
+        self.tile_size = tile_size
+        self.workers = workers or os.cpu_count() or 1
+
+    def render(self, shapes: List[Shape], area: pygame.Rect) -> pygame.Surface:
+        size = (area.width, area.height)
+        memory = shared_memory.SharedMemory(create=True, size=max(1, area.width * area.height * BYTES_PER_PIXEL))
+        slice_names = set()
+        try:
+            tiles = split_into_tiles(size, self.tile_size)
+            buckets: List[List[int]] = [[] for _ in tiles]
+            slices: List[Dict[int, LayerSlice]] = [{} for _ in tiles]
+            task_count = self.workers * TASKS_PER_WORKER
+
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_attach_worker,
+                                     initargs=(memory.name, size, area.topleft, shapes, self.tile_size)) as pool:
+                step = max(1, -(-len(shapes) // task_count))
+                assign_futures = [pool.submit(_assign_chunk, start, start + step)
+                                  for start in range(0, len(shapes), step)]
+                crossing: List[Tuple[int, List[int]]] = []
+                for future in assign_futures:
+                    chunk_buckets, chunk_crossing = future.result()
+                    for tile_index, bucket in chunk_buckets.items():
+                        buckets[tile_index].extend(bucket)
+                    crossing.extend(chunk_crossing.items())
+
+                slice_futures = [pool.submit(_slice_layers, strokes) for strokes in _chunks(crossing, task_count)]
+                for future in slice_futures:
+                    for index, tile_index, layer_slice in future.result():
+                        slices[tile_index][index] = layer_slice
+                        if layer_slice is not None:
+                            slice_names.add(layer_slice[0])
+
+                futures = [pool.submit(_render_tile, tuple(tile), bucket, tile_slices)
+                           for tile, bucket, tile_slices in zip(tiles, buckets, slices)]
+                for future in futures:
+                    future.result()
+
+            surface = pygame.image.frombuffer(memory.buf, size, PIXEL_FORMAT)
+        except BaseException:
+            memory.close()
+            raise
+        finally:
+            memory.unlink()
+            for name in slice_names:
+                slice_memory = shared_memory.SharedMemory(name=name)
+                slice_memory.close()
+                slice_memory.unlink()
+
+        weakref.finalize(surface, _release_memory, memory)
+        return surface
+
+    def save(self, shapes: List[Shape], area: pygame.Rect, filename: str):
+        pygame.image.save(self.render(shapes, area), filename)
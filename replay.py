@@ -0,0 +1,190 @@
+import os
+import sys
+import gzip
+import json
+import time
+import hashlib
+import tempfile
+import argparse
+import statistics
+from typing import List, Dict, Tuple, Optional, Union
+
+if __name__ == "__main__" and sys.argv[1:2] == ["replay"]:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from main import PygameCalculator, Shape, SymbolInstance, DEFAULT_WIDTH, DEFAULT_HEIGHT, GENERATED_CODE_FILE
+
+RECORDING_FORMAT_VERSION = 1
+RECORDED_EVENTS = [
+    pygame.QUIT, pygame.VIDEORESIZE, pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.KEYDOWN
+]
+RECORDED_ATTRIBUTES = ["pos", "rel", "buttons", "button", "w", "h", "size", "key", "mod", "unicode", "scancode"]
+
+
+def shape_state(shape: Union[Shape, SymbolInstance]) -> list:
+    if isinstance(shape, SymbolInstance):
+        return [shape.shape_type, [shape_state(part) for part in shape.symbol.shapes], list(shape.offset)]
+    return [shape.shape_type, list(shape.color), shape.points, shape.width, shape.filled, shape.rotation]
+
+
+def scene_checksum(shapes: List[Union[Shape, SymbolInstance]]) -> str:
+    state = [shape_state(shape) for shape in shapes]
+    return hashlib.sha256(json.dumps(state).encode()).hexdigest()
+
+
+def encode_event(event: pygame.event.Event) -> list:
+    attributes = {}
+    for name in RECORDED_ATTRIBUTES:
+        if hasattr(event, name):
+            attributes[name] = getattr(event, name)
+    return [event.type, attributes]
+
+
+def decode_event(data: list) -> pygame.event.Event:
+    event_type, attributes = data
+    attributes = {
+        name: tuple(value) if isinstance(value, list) else value
+        for name, value in attributes.items()
+    }
+    return pygame.event.Event(event_type, attributes)
+
+
+class EventRecorder:
+    def __init__(self, filename: str, size: Tuple[int, int]):
+        self.file = gzip.open(filename, "wt")
+        self.start = time.perf_counter()
+        self.file.write(json.dumps({"version": RECORDING_FORMAT_VERSION, "size": list(size)}) + "\n")
+
+    def record_frame(self, mouse_pos: Tuple[int, int], events: List[pygame.event.Event]):
+        recorded = [encode_event(event) for event in events if event.type in RECORDED_EVENTS]
+        if not recorded:
+            return
+        timestamp = round(time.perf_counter() - self.start, 4)
+        self.file.write(json.dumps([timestamp, list(mouse_pos), recorded], separators=(",", ":")) + "\n")
+
+    def close(self, shapes: List[Union[Shape, SymbolInstance]]):
+        self.file.write(json.dumps({"checksum": scene_checksum(shapes)}) + "\n")
+        self.file.close()
+
+
+class ReplayReport:
+    def __init__(self):
+        self.event_latencies: Dict[str, List[float]] = {}
+        self.frame_times: List[float] = []
+        self.expected_checksum: Optional[str] = None
+        self.actual_checksum: Optional[str] = None
+
+    @property
+    def checksum_matches(self) -> bool:
+        return self.expected_checksum is not None and self.expected_checksum == self.actual_checksum
+
+    def print_summary(self):
+        print(f"{'handler':<20}{'count':>8}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}")
+        for name, samples in sorted(self.event_latencies.items()):
+            print(self.format_row(name, samples))
+        print(self.format_row("render frame", self.frame_times))
+
+        if self.expected_checksum is None:
+            print("Checksum: not recorded")
+        elif self.checksum_matches:
+            print(f"Checksum: OK ({self.actual_checksum[:16]})")
+        else:
+            print(f"Checksum: MISMATCH (expected {self.expected_checksum[:16]}, got {self.actual_checksum[:16]})")
+
+    @staticmethod
+    def format_row(name: str, samples: List[float]) -> str:
+        if not samples:
+            return f"{name:<20}{0:>8}"
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return (f"{name:<20}{len(samples):>8}{statistics.mean(samples) * 1000:>10.3f}"
+                f"{p95 * 1000:>10.3f}{ordered[-1] * 1000:>10.3f}")
+
+
+class EventReplayer:
+    def __init__(self, filename: str, realtime: bool = False):
+        self.filename = filename
+        self.realtime = realtime
+
+    def replay(self) -> ReplayReport:
+        report = ReplayReport()
+        with gzip.open(self.filename, "rt") as f, tempfile.TemporaryDirectory() as output_dir:
+            header = json.loads(f.readline())
+            if header.get("version") != RECORDING_FORMAT_VERSION:
+                raise ValueError(f"Unsupported recording version: {header.get('version')}")
+
+            app = PygameCalculator(*header["size"])
+            app.generated_code_file = os.path.join(output_dir, GENERATED_CODE_FILE)
+            app.save_message_delay = 0
+            app.handle_event = self.timed(app.handle_event, report)
+            start = time.perf_counter()
+            running = True
+
+            for line in f:
+                record = json.loads(line)
+                if isinstance(record, dict):
+                    report.expected_checksum = record.get("checksum")
+                    break
+                if not running:
+                    continue
+
+                timestamp, mouse_pos, events = record
+                if self.realtime:
+                    delay = timestamp - (time.perf_counter() - start)
+                    if delay > 0:
+                        time.sleep(delay)
+
+                running = app.handle_events([decode_event(data) for data in events], tuple(mouse_pos))
+                if running:
+                    began = time.perf_counter()
+                    app.render_frame()
+                    report.frame_times.append(time.perf_counter() - began)
+
+        report.actual_checksum = scene_checksum(app.shapes)
+        return report
+
+    @staticmethod
+    def timed(handle_event, report: ReplayReport):
+        def timed_handle_event(event: pygame.event.Event, *args) -> bool:
+            began = time.perf_counter()
+            result = handle_event(event, *args)
+            elapsed = time.perf_counter() - began
+            report.event_latencies.setdefault(pygame.event.event_name(event.type), []).append(elapsed)
+            return result
+        return timed_handle_event
+
+
+def record(filename: str, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT):
+    app = PygameCalculator(width, height)
+    app.recorder = EventRecorder(filename, (app.width, app.height))
+    try:
+        app.run()
+    finally:
+        app.recorder.close(app.shapes)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Record and replay Pygame Calculator sessions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="run the editor and record its input")
+    record_parser.add_argument("file")
+
+    replay_parser = commands.add_parser("replay", help="replay a recording headlessly")
+    replay_parser.add_argument("file")
+    replay_parser.add_argument("--realtime", action="store_true", help="keep the recorded timing")
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        record(args.file)
+        return 0
+
+    report = EventReplayer(args.file, args.realtime).replay()
+    report.print_summary()
+    return 0 if report.checksum_matches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import os
+
+from main import PygameCalculator, Shape, Symbol, SymbolInstance
+
+
+def make_app(tmp_path, name: str) -> PygameCalculator:
+    app = PygameCalculator()
+    app.generated_code_file = str(tmp_path / name)
+    app.save_message_delay = 0
+    return app
+
+
+def export(app: PygameCalculator) -> str:
+    app.generate_pygame_code()
+    with open(app.generated_code_file) as f:
+        return f.read()
+
+
+def full_export(tmp_path, shapes) -> str:
+    app = make_app(tmp_path, "full.py")
+    app.shapes = list(shapes)
+    return export(app)
+
+
+def make_shapes():
+    symbol = Symbol([Shape("circle", (0, 0, 255), [(20, 20), (10,)], 2, False)])
+    return [
+        Shape("rectangle", (255, 0, 0), [(10, 10), (80, 60)], 2, True),
+        Shape("circle", (0, 255, 0), [(200, 150), (40,)], 3, False),
+        SymbolInstance(symbol, (300, 40)),
+        SymbolInstance(symbol, (340, 40)),
+        Shape("line", (0, 0, 0), [(5, 300), (400, 320)], 4, False),
+        Shape("polygon", (128, 0, 128), [(500, 100), (560, 180), (450, 170)], 1, False),
+    ]
+
+
+def test_incremental_export_matches_full_export(tmp_path):
+    app = make_app(tmp_path, "incremental.py")
+    app.shapes = make_shapes()
+    assert export(app) == full_export(tmp_path, app.shapes)
+
+    rectangle, circle, first, second, line, polygon = app.shapes
+    rectangle.move(15, -5)
+    circle.resize(0, 12, 0)
+    second.move(0, 30)
+    line.color = (10, 20, 30)
+    line.width = 7
+    line.touch()
+    app.shapes.insert(1, Shape("ellipse", (1, 2, 3), [(100, 200), (180, 260)], 2, True))
+    app.shapes.remove(polygon)
+    assert export(app) == full_export(tmp_path, app.shapes)
+
+    app.shapes.remove(first)
+    app.shapes.append(Shape("arc", (9, 9, 9), [(50, 50), (150, 120), 0.5, 2.5], 3, False))
+    assert export(app) == full_export(tmp_path, app.shapes)
+
+    app.shapes = []
+    assert export(app) == full_export(tmp_path, app.shapes)
+
+
+def test_export_rewrites_a_file_edited_outside_the_app(tmp_path):
+    app = make_app(tmp_path, "edited.py")
+    app.shapes = make_shapes()
+    written = export(app)
+
+    with open(app.generated_code_file, "w") as f:
+        f.write("#" * len(written))
+    stat = os.stat(app.generated_code_file)
+    os.utime(app.generated_code_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    app.shapes[-1].move(3, 3)
+    assert export(app) == full_export(tmp_path, app.shapes)
@@ -0,0 +1,59 @@
+import pickle
+import random
+import pygame
+
+from main import Shape, Symbol, SymbolInstance
+from renderer import TileRenderer, render_scene
+
+
+def make_scene(seed: int, width: int, height: int, count: int):
+    rng = random.Random(seed)
+    shapes = []
+    for _ in range(count):
+        shape_type = rng.choice(["rectangle", "circle", "ellipse", "line", "polygon", "arc"])
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        x, y = rng.randrange(-50, width + 50), rng.randrange(-50, height + 50)
+        end = (x + rng.randrange(-300, 300), y + rng.randrange(-300, 300))
+        if shape_type == "circle":
+            points = [(x, y), (rng.randrange(1, 200),)]
+        elif shape_type == "polygon":
+            points = [(x + rng.randrange(-200, 200), y + rng.randrange(-200, 200)) for _ in range(5)]
+        elif shape_type == "arc":
+            points = [(x, y), end, rng.random() * 3, 3 + rng.random() * 3]
+        else:
+            points = [(x, y), end]
+        filled = shape_type != "line" and rng.random() < 0.5
+        shape = Shape(shape_type, color, points, rng.randrange(1, 15), filled)
+        shape.selected = rng.random() < 0.05
+        shapes.append(shape)
+    return shapes
+
+
+def assert_same_pixels(shapes, area, tile_size):
+    expected = render_scene(shapes, area)
+    actual = TileRenderer(tile_size=tile_size, workers=2).render(shapes, area)
+    assert pygame.image.tobytes(actual, "RGBA") == pygame.image.tobytes(expected, "RGBA")
+
+
+def test_tiled_render_matches_single_process():
+    for seed in range(3):
+        assert_same_pixels(make_scene(seed, 700, 500, 300), pygame.Rect(40, 30, 700, 500), 64)
+
+
+def test_tiled_render_matches_with_strokes_spanning_the_image():
+    shapes = make_scene(7, 1500, 1100, 400)
+    shapes.append(Shape("rectangle", (0, 0, 0), [(0, 0), (1500, 1100)], 5, False))
+    shapes.append(Shape("line", (0, 0, 255), [(-20, 1120), (1520, -20)], 3, False))
+    shapes.append(Shape("polygon", (0, 128, 0), [(10, 10), (1490, 40), (700, 1090)], 2, False))
+    assert_same_pixels(shapes, pygame.Rect(0, 0, 1500, 1100), 128)
+
+
+def test_drawn_symbol_instances_pickle_for_workers():
+    symbol = Symbol([Shape("rectangle", (10, 20, 30), [(10, 10), (50, 40)], 2, False)])
+    instances = [SymbolInstance(symbol, (x * 60, 0)) for x in range(5)]
+    instances[0].draw(pygame.Surface((400, 100)))
+
+    restored = pickle.loads(pickle.dumps(instances))
+    assert restored[0].symbol is restored[1].symbol
+    assert restored[0].symbol.surface is None
+    assert_same_pixels(instances, pygame.Rect(0, 0, 400, 100), 64)
@@ -0,0 +1,46 @@
+import pygame
+
+from main import PygameCalculator, TOOLBAR_WIDTH
+from replay import EventRecorder, EventReplayer, scene_checksum
+
+
+def mouse(event_type: int, pos, **attributes) -> pygame.event.Event:
+    return pygame.event.Event(event_type, pos=pos, **attributes)
+
+
+def draw_rectangle(start, end):
+    return [
+        (start, [mouse(pygame.MOUSEBUTTONDOWN, start, button=1)]),
+        (end, [mouse(pygame.MOUSEMOTION, end, rel=(end[0] - start[0], end[1] - start[1]), buttons=(1, 0, 0))]),
+        (end, [mouse(pygame.MOUSEBUTTONUP, end, button=1)]),
+    ]
+
+
+def test_recorded_session_replays_to_the_same_scene(tmp_path):
+    filename = str(tmp_path / "session.rec")
+    app = PygameCalculator()
+    app.generated_code_file = str(tmp_path / "generated.py")
+    app.save_message_delay = 0
+    app.recorder = EventRecorder(filename, (app.width, app.height))
+
+    frames = draw_rectangle((TOOLBAR_WIDTH + 50, 60), (TOOLBAR_WIDTH + 200, 180))
+    frames += draw_rectangle((TOOLBAR_WIDTH + 300, 250), (TOOLBAR_WIDTH + 360, 400))
+    resized = (TOOLBAR_WIDTH + 100, 100)
+    frames.append((resized, [
+        pygame.event.Event(pygame.VIDEORESIZE, w=1000, h=700, size=(1000, 700)),
+        mouse(pygame.MOUSEBUTTONDOWN, resized, button=1),
+    ]))
+    frames.append((resized, [mouse(pygame.MOUSEBUTTONUP, resized, button=1)]))
+    frames.append((resized, [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_d, mod=pygame.KMOD_CTRL,
+                                                unicode="\x04", scancode=7)]))
+    for mouse_pos, events in frames:
+        assert app.handle_events(events, mouse_pos)
+    app.recorder.close(app.shapes)
+    assert len(app.shapes) == 3
+
+    report = EventReplayer(filename).replay()
+    assert report.checksum_matches
+    assert report.actual_checksum == scene_checksum(app.shapes)
+    assert report.event_latencies["MouseButtonDown"]
+    assert report.event_latencies["VideoResize"]
+    assert len(report.frame_times) == len(frames)
@@ -0,0 +1,52 @@
+import pygame
+
+from main import PygameCalculator, Shape, SymbolInstance
+
+
+def stamp(app: PygameCalculator, shape: Shape) -> SymbolInstance:
+    app.deselect_all_shapes()
+    shape.selected = True
+    app.selected_shape = shape
+    app.duplicate_selected_shape()
+    return app.selected_shape
+
+
+def render(shapes, size=(600, 400)) -> bytes:
+    surface = pygame.Surface(size)
+    surface.fill((255, 255, 255))
+    for shape in shapes:
+        shape.draw(surface)
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def test_stamping_a_moved_shape_reuses_its_symbol():
+    app = PygameCalculator()
+    shape = Shape("ellipse", (200, 40, 40), [(100, 80), (180, 140)], 3, False)
+    app.shapes = [shape]
+
+    first = stamp(app, shape)
+    shape.move(150, 90)
+    second = stamp(app, shape)
+    assert first.symbol is second.symbol
+    assert len(app.symbol_cache) == 1
+
+    shape.resize(3, 20, 20)
+    third = stamp(app, shape)
+    assert third.symbol is not first.symbol
+
+
+def test_instance_draws_like_the_stamped_shape():
+    app = PygameCalculator()
+    for shape in [
+        Shape("rectangle", (0, 128, 255), [(120, 60), (40, 20)], 4, False),
+        Shape("circle", (10, 200, 10), [(300, 200), (50,)], 0, True),
+        Shape("polygon", (90, 0, 90), [(400, 50), (470, 120), (380, 160)], 2, False),
+        Shape("arc", (0, 0, 0), [(50, 250), (200, 350), 0.3, 2.8], 5, False),
+    ]:
+        app.shapes = [shape]
+        instance = stamp(app, shape)
+        instance.selected = False
+        copy = shape.copy()
+        copy.selected = False
+        copy.move(app.grid_size, app.grid_size)
+        assert render([instance]) == render([copy])